@@ -1,31 +1,65 @@
 # core.py for Flask2Fly template
-from flask import Flask, render_template, jsonify, send_from_directory
+from flask import Flask, Response, render_template
+from jinja2 import FileSystemBytecodeCache
 from typing import Optional
 import datetime
+import functools
+import json
 import logging
 import os
+import time
+
+# Package directory, resolved once at import
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+@functools.lru_cache(maxsize=1)
+def _iso_timestamp(second: int) -> str:
+    """Format a timestamp at most once per second"""
+    return datetime.datetime.fromtimestamp(second).isoformat()
 
 class AppCore:
     def __init__(self):
         """Initialize core components"""
-        static_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+        static_folder = os.path.join(_HERE, 'static')
         self.app = Flask(__name__, 
                         static_folder=static_folder,
                         static_url_path='/static')
         
+        # Persist compiled template bytecode so cold starts skip the Jinja compiler;
+        # the default directory is per-user and its ownership is checked by Jinja
+        self.app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+        
+        # Templates and static files only change between deploys outside of development
+        if os.getenv('FLASK_ENV') != 'development':
+            self.app.config['TEMPLATES_AUTO_RELOAD'] = False
+            self.app.jinja_env.auto_reload = False
+            # send_file adds the ETag and answers If-None-Match with a 304
+            self.app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 3600
+        
         # Add app name configuration - will be replaced during project generation
-        self.app_name = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+        self.app_name = os.path.basename(_HERE)
         self.app.config.update(
             APP_NAME=self.app_name.title(),
             APP_DESCRIPTION='A Flask-powered web application'
         )
         
-        # Configure logging
-        logging.basicConfig(level=logging.DEBUG)
+        # Template context that does not change between requests
+        self._globals_static = self.template_globals()
+        
+        # Rendered pages that do not vary between requests
+        self._page_cache = {}
+        
+        # Constant part of the /health body, serialized once
+        self._health_prefix = '{"app":%s,"env":%s,"status":"healthy","timestamp":"' % (
+            json.dumps(self.app.config['APP_NAME']),
+            json.dumps(os.getenv('FLASK_ENV', 'production'))
+        )
+        
+        # Logging levels are configured by the entry point (main.py)
         self.logger = logging.getLogger(__name__)
         
         # Log static folder location
-        self.logger.info(f"Static folder configured at: {static_folder}")
+        self.logger.info("Static folder configured at: %s", static_folder)
         
         self.setup_routes()
         self.logger.info("Application initialized successfully")
@@ -34,68 +68,83 @@ class AppCore:
         """Return the Flask application instance"""
         return self.app
 
+    def render_cached(self, template: str, **context) -> str:
+        """Render a page once and reuse the HTML until the year rolls over"""
+        if self.app.debug:
+            return render_template(template, **context)
+        # now.year in the footer is the only per-request value the pages use
+        key = (template, datetime.date.today().year, tuple(sorted(context.items())))
+        html = self._page_cache.get(key)
+        if html is None:
+            html = self._page_cache[key] = render_template(template, **context)
+        return html
+
+    def template_globals(self) -> dict:
+        """Values shared by every template, built once at startup
+
+        A context.json beside this module, written when a project is generated
+        from this template, overrides any of the defaults below.
+        """
+        context = {
+            'site_name': self.app.config['APP_NAME'],
+            'app_name': self.app.config['APP_NAME'],
+            'app_description': self.app.config['APP_DESCRIPTION'],
+            'app_purpose': 'A modern Flask application framework',
+            'app_repo_url': 'https://github.com/yourusername/Flask2Fly',
+            'docs_url': 'https://github.com/yourusername/Flask2Fly/docs',
+            'key_features': [
+                {
+                    'icon': '🚀',
+                    'title': 'Quick Setup',
+                    'description': 'Get your application running in minutes'
+                },
+                {
+                    'icon': '⚙️',
+                    'title': 'Easy Configuration',
+                    'description': 'Simple configuration management with environment variables'
+                },
+                {
+                    'icon': '🔄',
+                    'title': 'Auto Deployment',
+                    'description': 'Integrated CI/CD pipeline with cloud deployment'
+                },
+                {
+                    'icon': '📦',
+                    'title': 'Modular Design',
+                    'description': 'Extensible architecture with support for feature modules'
+                }
+            ]
+        }
+
+        context_path = os.path.join(_HERE, 'context.json')
+        if os.path.exists(context_path):
+            with open(context_path, encoding='utf-8') as f:
+                context.update(json.load(f))
+        return context
+
     def setup_routes(self):
         """Configure application routes"""
         @self.app.context_processor
         def inject_globals():
             """Make common variables available to all templates"""
-            return {
-                'now': datetime.datetime.now(),
-                'site_name': self.app.config['APP_NAME'],
-                'app_name': self.app.config['APP_NAME'],
-                'app_description': self.app.config['APP_DESCRIPTION'],
-                'app_purpose': 'A modern Flask application framework',
-                'app_repo_url': 'https://github.com/yourusername/Flask2Fly',
-                'docs_url': 'https://github.com/yourusername/Flask2Fly/docs',
-                'key_features': [
-                    {
-                        'icon': '🚀',
-                        'title': 'Quick Setup',
-                        'description': 'Get your application running in minutes'
-                    },
-                    {
-                        'icon': '⚙️',
-                        'title': 'Easy Configuration',
-                        'description': 'Simple configuration management with environment variables'
-                    },
-                    {
-                        'icon': '🔄',
-                        'title': 'Auto Deployment',
-                        'description': 'Integrated CI/CD pipeline with cloud deployment'
-                    },
-                    {
-                        'icon': '📦',
-                        'title': 'Modular Design',
-                        'description': 'Extensible architecture with support for feature modules'
-                    }
-                ]
-            }
-
-        @self.app.route('/static/<path:filename>')
-        def serve_static(filename):
-            """Explicitly serve static files"""
-            return send_from_directory(os.path.join(self.app.root_path, 'static'), filename)
+            return {**self._globals_static, 'now': datetime.datetime.now()}
 
         @self.app.route('/')
         def index():
             """Home page route handler"""
-            return render_template('index.html', 
-                                title=f"Welcome to {self.app.config['APP_NAME']}")
+            return self.render_cached('index.html', 
+                                      title=f"Welcome to {self.app.config['APP_NAME']}")
 
         @self.app.route('/health')
         def health():
             """Health check endpoint"""
-            return jsonify({
-                'status': 'healthy',
-                'timestamp': datetime.datetime.now().isoformat(),
-                'app': self.app.config['APP_NAME'],
-                'env': os.getenv('FLASK_ENV', 'production')
-            })
+            body = self._health_prefix + _iso_timestamp(int(time.time())) + '"}\n'
+            return Response(body, mimetype='application/json')
 
         @self.app.errorhandler(404)
         def not_found_error(error):
-            return render_template('404.html', title="Page Not Found"), 404
+            return self.render_cached('404.html', title="Page Not Found"), 404
 
         @self.app.errorhandler(500)
         def internal_error(error):
-            return render_template('500.html', title="Server Error"), 500
\ No newline at end of file
+            return self.render_cached('500.html', title="Server Error"), 500
\ No newline at end of file
@@ -0,0 +1,20 @@
+# gunicorn.conf.py for Flask2Fly template
+import multiprocessing
+import os
+
+# Serve the ASGI wrapper from main.py on an event loop per worker
+wsgi_app = 'main:asgi_app'
+worker_class = 'uvicorn.workers.UvicornWorker'
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# The ASGI bridge does not make Flask handlers concurrent: WsgiToAsgi runs them
+# on a single thread, so each worker still serves one request at a time.
+# Never drop below the 4 workers the app ran with before, even on a 1-CPU VM.
+workers = int(os.getenv('WEB_CONCURRENCY', max(4, multiprocessing.cpu_count() * 2 + 1)))
+
+# Hold idle connections longer than the Fly proxy so it never reuses a closed socket
+keepalive = 650
+
+loglevel = 'debug' if os.getenv('FLASK_ENV') == 'development' else 'warning'
+accesslog = '-'
+errorlog = '-'
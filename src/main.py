@@ -1,20 +1,21 @@
 from app_name.core import AppCore
+from asgiref.wsgi import WsgiToAsgi
 from dotenv import load_dotenv
 import os
 import logging
 
-# Configure logging
+# Load .env first so FLASK_ENV can pick the log level
+load_dotenv()
+
+# Configure logging; DEBUG records are only built in development
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=logging.DEBUG if os.getenv('FLASK_ENV') == 'development' else logging.WARNING,
+    format='%(asctime)s %(levelname)s %(name)s %(message)s'
 )
 logger = logging.getLogger(__name__)
 
 def create_app():
     """Initialize and configure the application"""
-    # Load environment variables
-    load_dotenv()
-    
     # Create core instance
     core = AppCore()
     app = core.get_app()
@@ -23,17 +24,23 @@ def create_app():
     app.config.update(
         SECRET_KEY=os.getenv('FLASK_SECRET_KEY', 'dev-key-please-change'),
         ENV=os.getenv('FLASK_ENV', 'production'),
-        DEBUG=os.getenv('FLASK_ENV') == 'development'
+        DEBUG=os.getenv('FLASK_ENV') == 'development',
+        # Only enable behind a proxy that honours X-Sendfile (e.g. Nginx)
+        USE_X_SENDFILE=os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
     )
     
-    logger.info(f"Application initialized in {app.config['ENV']} mode")
+    logger.info("Application initialized in %s mode", app.config['ENV'])
     return app
 
 app = create_app()
 
+# ASGI entry point used in production: gunicorn -c gunicorn.conf.py
+asgi_app = WsgiToAsgi(app)
+
+# Development server only
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8000))
     debug = os.getenv('FLASK_ENV') == 'development'
     
-    logger.info(f"Starting server on port {port} with debug={debug}")
+    logger.info("Starting server on port %s with debug=%s", port, debug)
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -1,37 +1,32 @@
 import secrets
 import os
+import re
 from pathlib import Path
 
 def generate_secret_key():
     """Generate a secure secret key for Flask"""
     return secrets.token_hex(32)
 
-def update_env_file():
+def update_env_file(env_path: Path = Path('.env')):
     """Update or create .env file with new secret key"""
-    env_path = Path('.env')
     secret_key = generate_secret_key()
-    
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Update existing secret key
-        secret_key_found = False
-        for i, line in enumerate(lines):
-            if line.startswith('FLASK_SECRET_KEY='):
-                lines[i] = f'FLASK_SECRET_KEY={secret_key}\n'
-                secret_key_found = True
-                break
-        
-        if not secret_key_found:
-            lines.append(f'FLASK_SECRET_KEY={secret_key}\n')
-            
-        with open(env_path, 'w') as f:
-            f.writelines(lines)
-    else:
-        with open(env_path, 'w') as f:
-            f.write(f'FLASK_SECRET_KEY={secret_key}\n')
-    
+
+    text = env_path.read_text() if env_path.exists() else ''
+
+    # Update existing secret key in a single pass
+    content, replaced = re.subn(r'^FLASK_SECRET_KEY=.*$', f'FLASK_SECRET_KEY={secret_key}',
+                                text, count=1, flags=re.MULTILINE)
+
+    if not replaced:
+        if content and not content.endswith('\n'):
+            content += '\n'
+        content += f'FLASK_SECRET_KEY={secret_key}\n'
+
+    # Write to a temporary file and swap it in so .env is never left half-written
+    tmp_path = env_path.with_name(env_path.name + '.tmp')
+    tmp_path.write_text(content)
+    os.replace(tmp_path, env_path)
+
     print(f'Secret key generated and saved to .env file')
 
 if __name__ == '__main__':
@@ -1,19 +1,59 @@
+import asyncio
+import base64
+import hashlib
 import os
 import sys
 import shutil
 import subprocess
 import re
 from pathlib import Path
-import venv
 import stat
-import requests
-from openai import OpenAI
+import tempfile
 import json
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Union
+from flask_keygen import update_env_file
+
+# dulwich, openai, yaml and venv are imported where they are used; this import is for annotations only
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Configuration
 TEMPLATE_REPO = "https://github.com/bobbyhiddn/Flask2Fly.git"
+SETUP_IDENTITY = b"Setup Script <setup@local>"
+
+# Per-user cache shared by every generated project
+CACHE_DIR = Path.home() / ".cache" / "flask2fly"
+
+# Wheels downloaded by pip; OpenAI results live beside them, one subdirectory
+# per cached_call namespace (set FLASK2FLY_NO_CACHE=1 to bypass those)
+PIP_CACHE_DIR = CACHE_DIR / "pip"
+
+# Template names rewritten in a single pass over each generated file; longest
+# alternatives come first so a name never shadows a longer one that contains it
+TEMPLATE_NAMES = ("Flask2Fly", "flask2fly", "FLASK2FLY", "src/app_name/static")
+TEMPLATE_NAME_BYTES_PATTERN = re.compile(
+    b"|".join(re.escape(name.encode()) for name in sorted(TEMPLATE_NAMES, key=len, reverse=True))
+)
+
+# Directories never descended into when rewriting project files
+SKIP_DIRS = frozenset({".git", "venv", "__pycache__", "node_modules"})
+
+# Thread pool size for the I/O-bound file rewrites
+REWRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Compiled once at import instead of looked up in re's cache on every call
+PROJECT_NAME_PATTERN = re.compile(r'[a-zA-Z][a-zA-Z0-9_-]*')
+FLY_APP_PATTERN = re.compile(rb'^app = .*$', re.MULTILINE)
+COMPOSE_SERVICE_PATTERN = re.compile(rb'^  [a-zA-Z0-9_-]*:', re.MULTILINE)
+# The package name, but not attributes (self.app_name) or string keys ('app_name')
+APP_NAME_BYTES_PATTERN = re.compile(rb'(?<![.\'"])\bapp_name\b(?![\'"])')
+JSON_DECODER = json.JSONDecoder()
+CSS_COLOR_PATTERN = re.compile(r'--([a-z-]+): #[0-9a-fA-F]{6};')
+FLYCTL_APP_PATTERN = re.compile(r'flyctl (?:deploy --remote-only$|secrets set\b)', re.MULTILINE)
 
 class Colors:
     RED = '\033[0;31m'
@@ -37,7 +77,7 @@ def validate_inputs(project_name: str) -> None:
         print("Example: setup.py MyNewProject ./projects")
         sys.exit(1)
 
-    if not re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*$', project_name):
+    if not PROJECT_NAME_PATTERN.fullmatch(project_name):
         print_error("Project name must start with a letter and contain only letters, numbers, hyphens, and underscores")
 
 def setup_project_directory(project_dir: Path, project_name: str) -> Path:
@@ -65,147 +105,238 @@ def rename_project_files(project_path: Path, project_name: str) -> None:
         shutil.rmtree(new_app_dir)
     app_dir.rename(new_app_dir)
 
-def update_python_files(project_path: Path, project_name: str) -> None:
-    """Update Python imports and references."""
-    # Update main.py specifically
-    main_py = project_path / "src" / "main.py"
-    if main_py.exists():
-        try:
-            content = main_py.read_text(encoding='utf-8')
-            content = content.replace("from app_name.core", f"from {project_name}.core")
-            main_py.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {main_py} due to encoding issues")
-
-    # Update all Python files recursively
-    for py_file in project_path.rglob("*.py"):
-        try:
-            content = py_file.read_text(encoding='utf-8')
-            content = re.sub(r'from app_name\.', f'from {project_name}.', content)
-            content = re.sub(r'import app_name\.', f'import {project_name}.', content)
-            content = content.replace("app_name", project_name)
-            py_file.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {py_file} due to encoding issues")
-
-def generate_theme(project_name: str, project_description: str) -> tuple[dict, bytes]:
-    """Generate a theme and logo using OpenAI APIs."""
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        print_error("OPENAI_API_KEY environment variable is required for theme generation")
+@dataclass(frozen=True)
+class RenameSpec:
+    """Every spelling of a new project's name, computed once and shared by all rewrites."""
+    name: str
+    name_bytes: bytes
+    byte_map: dict
+
+    @classmethod
+    def for_project(cls, project_name: str) -> "RenameSpec":
+        rename_map = {
+            "Flask2Fly": project_name,
+            "flask2fly": project_name.lower(),
+            "FLASK2FLY": project_name.upper(),
+            "src/app_name/static": f"src/{project_name}/static"
+        }
+        return cls(
+            name=project_name,
+            name_bytes=project_name.encode('utf-8'),
+            byte_map={old.encode(): new.encode() for old, new in rename_map.items()}
+        )
+
+    def replace_names_bytes(self, data: bytes) -> tuple[bytes, int]:
+        """Replace every template name in one scan of raw file bytes, returning (new, count) like re.subn."""
+        return TEMPLATE_NAME_BYTES_PATTERN.subn(lambda m: self.byte_map[m.group(0)], data)
 
-    client = OpenAI(api_key=api_key)
+def write_file_bytes(path: Union[str, Path], data: bytes, dir_fd: Optional[int] = None) -> None:
+    """Write pre-encoded bytes with one unbuffered open/write/close, relative to dir_fd if given."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644, dir_fd=dir_fd)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def populate_directory(directory: Path, subdirs, files: dict) -> None:
+    """Create subdirectories and new files inside one directory in a single batch.
+
+    Where the platform allows, the directory is opened once and every entry is
+    created relative to it instead of resolving the full path each time.
+    """
+    if os.open in os.supports_dir_fd and os.mkdir in os.supports_dir_fd:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            for name in subdirs:
+                try:
+                    os.mkdir(name, dir_fd=dir_fd)
+                except FileExistsError:
+                    pass
+            for name, data in files.items():
+                write_file_bytes(name, data, dir_fd=dir_fd)
+        finally:
+            os.close(dir_fd)
+        return
 
+    for name in subdirs:
+        (directory / name).mkdir(exist_ok=True)
+    for name, data in files.items():
+        write_file_bytes(directory / name, data)
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to a temporary sibling and swap it into place, so a file is never left half-written."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    write_file_bytes(tmp_path, data)
+    # Keep the original's permissions, e.g. the executable bit on shell scripts
+    if path.exists():
+        shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+
+def walk_project_files(root: Path):
+    """Yield (path, suffix) for each file under root in one scandir walk, pruning SKIP_DIRS."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file():
+                    yield Path(entry.path), os.path.splitext(entry.name)[1]
+
+def rewrite_python_file(py_file: Path, spec: RenameSpec) -> None:
+    """Update Python imports and references in a single file."""
+    raw = py_file.read_bytes()
+    # The name is ASCII, so the bytes are rewritten without a decode/encode round trip.
+    # Covers "from app_name." and "import app_name." as well as bare references.
+    new, count = APP_NAME_BYTES_PATTERN.subn(spec.name_bytes, raw)
+    if count:
+        atomic_write_bytes(py_file, new)
+
+def update_project_files(project_path: Path, spec: RenameSpec) -> None:
+    """Rewrite Python sources and HTML templates in a single walk of the project tree."""
+    handlers = {
+        ".py": partial(rewrite_python_file, spec=spec),
+        ".html": partial(replace_template_names_in_file, spec=spec)
+    }
+    work = [(handlers[suffix], path) for path, suffix in walk_project_files(project_path) if suffix in handlers]
+
+    # File rewrites are independent and release the GIL during I/O
+    with ThreadPoolExecutor(max_workers=REWRITE_WORKERS) as executor:
+        list(executor.map(lambda item: item[0](item[1]), work))
+
+def extract_json(text: str):
+    """Decode the first JSON object or array in a model response, ignoring any text around it."""
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON value found in response")
+    return JSON_DECODER.raw_decode(text, min(starts))[0]
+
+def cached_call(namespace: str, key: dict, fn, suffix: str = ".json", cache_if=None):
+    """Return fn(), reusing the result stored on disk for an identical key.
+
+    JSON results are cached as-is; pass a non-.json suffix for raw bytes.
+    Nothing is stored when fn raises, or when cache_if returns False for the result.
+    """
+    use_cache = os.getenv('FLASK2FLY_NO_CACHE') != '1'
+    digest = hashlib.blake2b(json.dumps(key, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+    path = CACHE_DIR / namespace / f"{digest}{suffix}"
+    is_json = suffix == ".json"
+
+    if use_cache and path.exists():
+        logging.debug(f"Using cached {namespace} result from {path}")
+        data = path.read_bytes()
+        return json.loads(data) if is_json else data
+
+    result = fn()
+    if use_cache and (cache_if is None or cache_if(result)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, json.dumps(result).encode('utf-8') if is_json else result)
+    return result
+
+def validate_features(features) -> list:
+    """Return features unchanged if they are exactly 4 complete entries, otherwise raise ValueError."""
+    if not isinstance(features, list) or len(features) != 4:
+        raise ValueError("Invalid features format")
+    for feature in features:
+        if not isinstance(feature, dict):
+            raise ValueError("Feature is not an object")
+        if not all(key in feature for key in ["icon", "title", "description"]):
+            raise ValueError("Features missing required fields")
+    return features
+
+def has_valid_features(content: dict) -> bool:
+    """Whether a content response carries a usable feature list."""
     try:
-        # Generate color scheme
-        color_response = client.chat.completions.create(
-            model="gpt-4o",
+        validate_features(content.get("features"))
+    except ValueError:
+        return False
+    return True
+
+def generate_site_content(project_name: str, project_description: str, client: "OpenAI") -> tuple[dict, list]:
+    """Generate the color scheme and key features with a single chat completion."""
+    prompt = f"""Design a web application named "{project_name}". Description: {project_description}
+Return ONLY a JSON object with two keys:
+- 'colors': an object with these colors in hex format: primary-color, secondary-color, background-color, text-color, text-primary
+- 'features': an array of exactly 4 features, where each feature has an 'icon' (single emoji), 'title' (2-3 words), and 'description' (10-15 words). Features should be specific to the project's purpose."""
+
+    def request_content() -> dict:
+        # A small model in JSON mode is plenty for five hex colors and four short features
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
             messages=[{
                 "role": "user",
-                "content": f'Create a modern color scheme for a web application named "{project_name}". Description: {project_description}. Return ONLY a JSON object with these colors in hex format: primary-color, secondary-color, background-color, text-color, text-primary'
+                "content": prompt
             }],
+            response_format={"type": "json_object"},
             temperature=0.7
         )
-        
-        raw_content = color_response.choices[0].message.content
-        logging.debug(f"Raw API response: {raw_content}")
-        
-        try:
-            clean_content = raw_content.strip()
-            if clean_content.startswith("```"):
-                clean_content = clean_content.split("\n", 1)[1]
-                clean_content = clean_content.rsplit("\n", 1)[0]
-            
-            colors = json.loads(clean_content)
-        except json.JSONDecodeError as e:
-            logging.error(f"JSON parsing error: {e}")
-            logging.error(f"Failed to parse response: {raw_content}")
-            logging.error(f"Cleaned content: {clean_content}")
-            raise Exception("Failed to parse theme colors from API response")
-        
-        # Generate logo
+        raw_content = response.choices[0].message.content
+        logging.debug(f"Raw GPT content response: {raw_content}")
+        content = extract_json(raw_content)
+        # The colors are required; a response without them is not worth caching
+        if not isinstance(content, dict) or "primary-color" not in (content.get("colors") or {}):
+            raise ValueError("Response is missing the color scheme")
+        return content
+
+    # Only fully valid content is stored, so a response with bad features is retried next run
+    content = cached_call(
+        "content",
+        {"model": "gpt-4o-mini", "prompt": prompt, "temperature": 0.7},
+        request_content,
+        cache_if=has_valid_features
+    )
+
+    try:
+        features = validate_features(content.get("features"))
+    except ValueError as e:
+        logging.error(f"Failed to parse GPT features: {e}")
+        features = get_fallback_features(project_name)
+
+    return content["colors"], features
+
+def generate_logo(project_name: str, project_description: str, primary_color: str, logo_out_path: Path, client: "OpenAI") -> None:
+    """Generate a logo with DALL-E, writing it straight to logo_out_path."""
+    logo_prompt = f'Create a modern, minimalist logo for "{project_name}". Description: {project_description}. Style: 2D, clean, geometric, professional. NO text, just a simple icon that represents the project. Use {primary_color} as the main color. Make it suitable as a website logo. 2D, stylized image.'
+
+    def request_logo() -> bytes:
         image_response = client.images.generate(
             model="dall-e-3",
-            prompt=f'Create a modern, minimalist logo for "{project_name}". Description: {project_description}. Style: 2D, clean, geometric, professional. NO text, just a simple icon that represents the project. Use {colors["primary-color"]} as the main color. Make it suitable as a website logo. 2D, stylized image.',
+            prompt=logo_prompt,
             size="1024x1024",
             n=1,
-            response_format="url"
+            response_format="b64_json"
         )
-        
-        logo_url = image_response.data[0].url
-        logo_response = requests.get(logo_url)
-        if logo_response.status_code != 200:
-            raise Exception("Failed to download generated logo")
-
-        return colors, logo_response.content
-    except Exception as e:
-        logging.error(f"Failed to generate theme: {str(e)}")
-        raise
-
-def update_theme_files(project_path: Path, colors: dict, logo_content: bytes) -> None:
+        # The image comes back inline, saving a second download from the CDN
+        return base64.b64decode(image_response.data[0].b64_json)
+
+    logo_content = cached_call(
+        "logos",
+        {"model": "dall-e-3", "prompt": logo_prompt, "size": "1024x1024"},
+        request_logo,
+        suffix=".png"
+    )
+    atomic_write_bytes(logo_out_path, logo_content)
+
+def update_theme_files(project_path: Path, colors: dict, logo_file: Path) -> None:
     """Update theme files with generated content."""
-    # Save the logo
+    # Move the logo into place; it was written to disk while the project was being built
     static_img_path = project_path / "src" / project_path.name / "static" / "img"
     static_img_path.mkdir(parents=True, exist_ok=True)
-    (static_img_path / "logo.png").write_bytes(logo_content)
+    shutil.move(str(logo_file), str(static_img_path / "logo.png"))
 
     # Update CSS with new colors
     css_path = project_path / "src" / project_path.name / "static" / "css" / "styles.css"
     if css_path.exists():
         css_content = css_path.read_text(encoding='utf-8')
-        for var_name, color in colors.items():
-            css_content = re.sub(
-                f'--{var_name}: #[0-9a-fA-F]{{6}};',
-                f'--{var_name}: {color};',
-                css_content
-            )
-        css_path.write_text(css_content, encoding='utf-8')
-
-def generate_features(project_name: str, project_description: str, client: OpenAI) -> list:
-    """Generate customized features using GPT based on project description"""
-    try:
-        # Craft a prompt that will result in structured feature data
-        prompt = f"""Generate 4 key features for a web application named "{project_name}". Description: {project_description}
-Return ONLY a JSON object with a 'features' key containing an array of exactly 4 features, where each feature has an 'icon' (single emoji), 'title' (2-3 words), and 'description' (10-15 words).
-Features should be specific to the project's purpose."""
-
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{
-                "role": "user",
-                "content": prompt
-            }],
-            response_format={ "type": "json_object" },
-            temperature=0.7,
+        # One scan over the stylesheet, swapping only the variables we have colors for
+        css_content = CSS_COLOR_PATTERN.sub(
+            lambda m: f'--{m.group(1)}: {colors[m.group(1)]};' if m.group(1) in colors else m.group(0),
+            css_content
         )
-        
-        # Get the raw response
-        raw_content = response.choices[0].message.content
-        logging.debug(f"Raw GPT features response: {raw_content}")
-        
-        try:
-            features = json.loads(raw_content)
-            # If the response is wrapped in a JSON object, extract the features array
-            if isinstance(features, dict) and "features" in features:
-                features = features["features"]
-            if not isinstance(features, list) or len(features) != 4:
-                raise ValueError("Invalid features format")
-            
-            # Validate each feature has required fields
-            for feature in features:
-                if not all(key in feature for key in ["icon", "title", "description"]):
-                    raise ValueError("Features missing required fields")
-            
-            return features
-            
-        except (json.JSONDecodeError, ValueError) as e:
-            logging.error(f"Failed to parse GPT response: {e}")
-            logging.error(f"Raw response was: {raw_content}")
-            return get_fallback_features(project_name)
-            
-    except Exception as e:
-        logging.error(f"Error generating features: {e}")
-        return get_fallback_features(project_name)
+        atomic_write_bytes(css_path, css_content.encode('utf-8'))
 
 def get_fallback_features(project_name: str) -> list:
     """Provide fallback features if GPT generation fails"""
@@ -232,131 +363,99 @@ def get_fallback_features(project_name: str) -> list:
         }
     ]
 
-def update_configuration_files(project_path: Path, project_name: str, project_description: str, client: OpenAI) -> None:
+def replace_template_names_in_file(path: Path, spec: RenameSpec) -> None:
+    """Replace every template name in a file in one pass over its raw bytes, writing only on change."""
+    data = path.read_bytes()
+    new, count = spec.replace_names_bytes(data)
+    if count:
+        atomic_write_bytes(path, new)
+
+def workflow_app_name(content: str, project_name: str) -> str:
+    """Return the Fly app a workflow deploys to: the project for main, its dev- twin otherwise."""
+    import yaml
+
+    doc = yaml.safe_load(content) or {}
+    # PyYAML follows YAML 1.1, where a bare `on` key loads as True
+    triggers = doc.get("on", doc.get(True)) or {}
+    push = (triggers.get("push") if isinstance(triggers, dict) else None) or {}
+    branches = push.get("branches") or []
+    if isinstance(branches, str):
+        branches = [branches]
+    return project_name if "main" in branches else f"dev-{project_name}"
+
+def update_workflow_file(workflow: Path, project_name: str) -> None:
+    """Point a workflow's flyctl commands at the app its trigger branches deploy to."""
+    content = workflow.read_text(encoding='utf-8')
+    if not FLYCTL_APP_PATTERN.search(content):
+        return
+    app = workflow_app_name(content, project_name)
+    # The text is edited in place rather than re-dumped so comments and layout survive
+    updated = FLYCTL_APP_PATTERN.sub(lambda m: f"{m.group(0)} --app {app}", content)
+    if updated != content:
+        atomic_write_bytes(workflow, updated.encode('utf-8'))
+
+def rewrite_config_file(file_path: Path, update_func, spec: RenameSpec) -> None:
+    """Apply a file's own substitution plus the template names, writing only on change."""
+    # Every replacement is ASCII, so the file never needs decoding
+    data = file_path.read_bytes()
+    updated, own_count = update_func(data)
+    updated, name_count = spec.replace_names_bytes(updated)
+    if own_count or name_count:
+        atomic_write_bytes(file_path, updated)
+
+def update_configuration_files(project_path: Path, spec: RenameSpec, project_description: str, features: list) -> None:
     """Update various configuration files with the project name."""
-    features = generate_features(project_name, project_description, client)
+    project_name = spec.name
     
-    # Core configuration files to update
+    # Configuration files that need a regex substitution besides the names
     files_to_update = {
-        "fly.toml": (lambda c: re.sub(r'^app = .*$', f"app = '{project_name}'", c, flags=re.MULTILINE)),
-        "docker-compose.yml": (lambda c: re.sub(r'^  [a-zA-Z0-9_-]*:', f"  {project_name}:", c, flags=re.MULTILINE)),
-        "Dockerfile": (lambda c: c.replace("src/app_name/static", f"src/{project_name}/static")),
-        "README.md": (lambda c: c.replace("Flask2Fly", project_name))
+        "fly.toml": partial(FLY_APP_PATTERN.subn, f"app = '{project_name}'".encode()),
+        "docker-compose.yml": partial(COMPOSE_SERVICE_PATTERN.subn, f"  {project_name}:".encode())
     }
 
-    # Update base configuration files
-    for filename, update_func in files_to_update.items():
-        file_path = project_path / filename
-        if file_path.exists():
-            try:
-                content = file_path.read_text(encoding='utf-8')
-                updated_content = update_func(content)
-                updated_content = updated_content.replace("Flask2Fly", project_name)
-                updated_content = updated_content.replace("flask2fly", project_name.lower())
-                updated_content = updated_content.replace("FLASK2FLY", project_name.upper())
-                file_path.write_text(updated_content, encoding='utf-8')
-            except UnicodeDecodeError:
-                print_status(f"Warning: Could not update {filename} due to encoding issues")
-
-    # Update core.py with features
-    core_file = project_path / "src" / project_name / "core.py"
-    if core_file.exists():
-        try:
-            content = core_file.read_text(encoding='utf-8')
-            
-            # Create new context with features
-            features_list = []
-            for feature in features:
-                features_list.append({
-                    "icon": feature["icon"],
-                    "title": feature["title"],
-                    "description": feature["description"]
-                })
-            
-            # Format the features JSON with proper indentation
-            features_lines = []
-            features_lines.append("[")
-            for i, feature in enumerate(features_list):
-                feature_json = json.dumps(feature, indent=4, ensure_ascii=False)
-                # Indent each line of the feature
-                feature_lines = feature_json.splitlines()
-                for j, line in enumerate(feature_lines):
-                    if j == 0:  # First line
-                        features_lines.append("                    " + line)
-                    else:
-                        features_lines.append("                        " + line.lstrip())
-                if i < len(features_list) - 1:
-                    features_lines[-1] += ","
-            features_lines.append("                ]")
-            features_json = "\n".join(features_lines)
-            
-            # Create a properly indented return statement
-            context_str = """            return {
-                'now': datetime.datetime.now(),
-                'site_name': '%s',
-                'app_name': '%s',
-                'app_description': '%s',
-                'app_purpose': '%s',
-                'app_repo_url': f'https://github.com/yourusername/%s',
-                'docs_url': f'https://github.com/yourusername/%s/docs',
-                'key_features': %s
-            }""" % (
-                project_name,
-                project_name,
-                project_description,
-                project_description,
-                project_name,
-                project_name,
-                features_json
-            )
-            
-            # Find the inject_globals function and replace its entire content
-            inject_pattern = r'def inject_globals\(\):[\s\S]*?return\s*{[\s\S]*?key_features[\s\S]*?\][\s\S]*?}'
-            
-            replacement = f"""def inject_globals():
-            \"\"\"Make common variables available to all templates\"\"\"
-{context_str}"""
-            
-            # Use re.sub with re.MULTILINE and re.DOTALL flags
-            content = re.sub(inject_pattern, replacement, content, flags=re.MULTILINE | re.DOTALL)
-            
-            # Update other references
-            content = content.replace("Flask2Fly", project_name)
-            content = content.replace("flask2fly", project_name.lower())
-            
-            core_file.write_text(content, encoding='utf-8')
-        except UnicodeDecodeError:
-            print_status(f"Warning: Could not update {core_file} due to encoding issues")
-
-    # Update templates and HTML files
-    template_dir = project_path / "src" / project_name / "templates"
-    if template_dir.exists():
-        for template in template_dir.glob("**/*.html"):
-            try:
-                content = template.read_text(encoding='utf-8')
-                content = content.replace("Flask2Fly", project_name)
-                content = content.replace("flask2fly", project_name.lower())
-                content = content.replace("FLASK2FLY", project_name.upper())
-                content = content.replace("flask2fly logo", f"{project_name.lower()} logo")
-                template.write_text(content, encoding='utf-8')
-            except UnicodeDecodeError:
-                print_status(f"Warning: Could not update {template} due to encoding issues")
+    # Files that only need the template names replaced
+    literal_files = ["Dockerfile", "README.md", "utils/fly_deploy.sh", f"src/{project_name}/core.py"]
 
-def initialize_modules(project_path: Path) -> None:
-    """Initialize local module directories."""
-    modules_dir = project_path / "src" / "modules"
-    pages_dir = modules_dir / "pages"
-    pages_dir.mkdir(parents=True, exist_ok=True)
+    # Every file below is rewritten independently, so they all share one pool
+    jobs = [
+        partial(rewrite_config_file, project_path / filename, update_func, spec)
+        for filename, update_func in files_to_update.items()
+        if (project_path / filename).exists()
+    ]
+    workflows_dir = project_path / ".github" / "workflows"
+    if workflows_dir.is_dir():
+        jobs.extend(partial(update_workflow_file, workflow, project_name) for workflow in workflows_dir.glob("*.yml"))
+    jobs.extend(
+        partial(replace_template_names_in_file, project_path / filename, spec)
+        for filename in literal_files
+        if (project_path / filename).exists()
+    )
+    with ThreadPoolExecutor(max_workers=REWRITE_WORKERS) as executor:
+        list(executor.map(lambda job: job(), jobs))
+
+    # The app reads its template globals from context.json at startup, so the
+    # generated values are written as data instead of being spliced into core.py
+    context = {
+        "site_name": project_name,
+        "app_name": project_name,
+        "app_description": project_description,
+        "app_purpose": project_description,
+        "app_repo_url": f"https://github.com/yourusername/{project_name}",
+        "docs_url": f"https://github.com/yourusername/{project_name}/docs",
+        "key_features": [
+            {key: feature[key] for key in ("icon", "title", "description")}
+            for feature in features
+        ]
+    }
+    atomic_write_bytes(
+        project_path / "src" / project_name / "context.json",
+        json.dumps(context, indent=4, ensure_ascii=False).encode('utf-8')
+    )
 
-    # Initialize pages as a local Git repository
-    subprocess.run(["git", "init"], cwd=pages_dir, check=True)
-    
-    # Create basic structure
-    for subdir in ["docs", "articles", "templates"]:
-        (pages_dir / subdir).mkdir(exist_ok=True)
+# Scaffolding written into the local pages module
+PAGES_SUBDIRS = ("docs", "articles", "templates")
 
-    # Create .gitignore
-    gitignore_content = """__pycache__/
+PAGES_GITIGNORE = """__pycache__/
 *.py[cod]
 *$py.class
 .env
@@ -366,12 +465,10 @@ venv/
 .idea/
 .vscode/
 """
-    (pages_dir / ".gitignore").write_text(gitignore_content, encoding='utf-8')
 
-    # Create README.md
-    readme_content = f"""# Pages Module
+PAGES_README_TEMPLATE = """# Pages Module
 
-This module contains the pages and documentation for {project_path.name}.
+This module contains the pages and documentation for {project_name}.
 It is initialized as a local Git repository that can be synchronized with a remote repository if desired.
 
 ## Directory Structure
@@ -400,100 +497,110 @@ To synchronize with a remote repository:
    git push -u origin main
    ```
 """
-    (pages_dir / "README.md").write_text(readme_content, encoding='utf-8')
+
+def initialize_modules(project_path: Path) -> None:
+    """Initialize local module directories."""
+    modules_dir = project_path / "src" / "modules"
+    pages_dir = modules_dir / "pages"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+
+    # Initialize pages as a local Git repository
+    from dulwich import porcelain
+    porcelain.init(str(pages_dir))
+    
+    # Create basic structure; the repository is brand new, so nothing here is overwritten
+    populate_directory(pages_dir, PAGES_SUBDIRS, {
+        ".gitignore": PAGES_GITIGNORE.encode('utf-8'),
+        "README.md": PAGES_README_TEMPLATE.format(project_name=project_path.name).encode('utf-8')
+    })
 
     # Initial commit
-    subprocess.run(["git", "add", "."], cwd=pages_dir, check=True)
-    subprocess.run(
-        ["git", "commit", "-m", "Initial pages module setup"],
-        cwd=pages_dir,
-        env={**os.environ, 'GIT_AUTHOR_NAME': 'Setup Script', 'GIT_AUTHOR_EMAIL': 'setup@local'},
-        check=True
+    porcelain.add(str(pages_dir))
+    porcelain.commit(
+        str(pages_dir),
+        message=b"Initial pages module setup",
+        author=SETUP_IDENTITY,
+        committer=SETUP_IDENTITY
     )
 
 def setup_virtual_environment(project_path: Path) -> None:
     """Set up and configure the virtual environment."""
     venv_path = project_path / "venv"
-    venv.create(venv_path, with_pip=True)
-    
-    pip_path = venv_path / "bin" / "pip" if os.name != 'nt' else venv_path / "Scripts" / "pip"
+    bin_dir = venv_path / "bin" if os.name != 'nt' else venv_path / "Scripts"
+    python_path = bin_dir / ("python.exe" if os.name == 'nt' else "python")
     requirements_path = project_path / "src" / "requirements.txt"
+
+    # uv creates the environment and installs packages in parallel; --seed still
+    # puts pip in the venv so it works like one built by EnvBuilder
+    uv_path = shutil.which("uv")
+    if uv_path:
+        subprocess.run([uv_path, "venv", "--seed", str(venv_path)], check=True)
+        subprocess.run(
+            [uv_path, "pip", "install", "--python", str(python_path), "-r", str(requirements_path)],
+            check=True
+        )
+        return
+
+    # Symlink the interpreter instead of copying it where the platform allows
+    import venv
+    venv.EnvBuilder(symlinks=(os.name != 'nt'), with_pip=True, upgrade_deps=False).create(venv_path)
     
+    # Reuse downloaded wheels across generated projects and skip byte-compiling on install
     subprocess.run(
-        [str(pip_path), "install", "-r", str(requirements_path)],
+        [str(python_path), "-I", "-m", "pip", "install", "--no-compile", "--prefer-binary",
+         "--disable-pip-version-check", "--cache-dir", str(PIP_CACHE_DIR), "-q", "-r", str(requirements_path)],
         check=True
     )
 
 def setup_git_hooks(project_path: Path) -> None:
-    """Set up Git hooks."""
-    hooks_dir = project_path / ".git" / "hooks"
-    hooks_dir.mkdir(parents=True, exist_ok=True)
-    
-    shutil.copy2(
-        project_path / "utils" / "pre-push",
-        hooks_dir / "pre-push"
-    )
-    (hooks_dir / "pre-push").chmod(0o755)
+    """Point Git at the tracked hooks in utils/ so edits to them take effect without reinstalling."""
+    from dulwich.repo import Repo
+
+    repo = Repo(str(project_path))
+    try:
+        config = repo.get_config()
+        config.set((b"core",), b"hooksPath", b"utils")
+        config.write_to_path()
+    finally:
+        repo.close()
 
 def initialize_project(project_path: Path) -> None:
     """Initialize the project with Git and virtual environment."""
-    subprocess.run(["git", "init"], cwd=project_path, check=True)
-    
     env_file = project_path / ".env"
-    env_file.touch()
 
-    subprocess.run(
-        ["python", "utils/flask_keygen.py"],
-        cwd=project_path,
-        check=True
-    )
+    def init_git() -> None:
+        # The hooks path is repository config, so it must wait for the repository to exist
+        from dulwich import porcelain
+        porcelain.init(str(project_path))
+        setup_git_hooks(project_path)
+
+    # The venv install dominates, so run the independent cheap steps alongside it
+    async def run_setup_steps() -> None:
+        await asyncio.gather(
+            asyncio.to_thread(init_git),
+            asyncio.to_thread(update_env_file, env_file),
+            asyncio.to_thread(setup_virtual_environment, project_path)
+        )
+
+    asyncio.run(run_setup_steps())
 
-    setup_virtual_environment(project_path)
-    setup_git_hooks(project_path)
+def make_writable_and_retry(func, path, exc_info) -> None:
+    """rmtree error handler that clears the read-only bit and retries the failed call."""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
 
 def safe_remove_git_dir(path: Path) -> None:
-    """Safely remove a git directory on Windows."""
+    """Safely remove a git directory, including read-only files on Windows."""
     if not path.exists():
         return
 
-    def on_rm_error(func, path, exc_info):
-        try:
-            os.chmod(path, stat.S_IWRITE)
-            os.unlink(path)
-        except Exception:
-            pass
-
     try:
-        # Clean the git repo first
-        try:
-            subprocess.run(["git", "clean", "-fd"], cwd=path, check=False, capture_output=True)
-            subprocess.run(["git", "gc"], cwd=path, check=False, capture_output=True)
-        except Exception:
-            pass
-
-        # Try standard removal first
-        shutil.rmtree(path, onerror=on_rm_error)
-        
-        # If directory still exists, try more aggressive cleanup
-        if path.exists():
-            for p in path.rglob('*'):
-                try:
-                    p.chmod(stat.S_IWRITE)
-                except Exception:
-                    pass
-            shutil.rmtree(path, ignore_errors=True)
-        
-        # Last resort: use system commands
-        if path.exists():
-            try:
-                if os.name == 'nt':
-                    subprocess.run(['rmdir', '/S', '/Q', str(path)], check=False, capture_output=True)
-                else:
-                    subprocess.run(['rm', '-rf', str(path)], check=False, capture_output=True)
-            except Exception:
-                pass
-
-    except Exception as e:
+        # One tree walk; read-only pack files are fixed up only when they fail
+        if sys.version_info >= (3, 12):
+            shutil.rmtree(path, onexc=make_writable_and_retry)
+        else:
+            shutil.rmtree(path, onerror=make_writable_and_retry)
+    except Exception:
         print_status(f"Warning: Could not fully clean up {path}. You may want to remove it manually.")
 
 def main() -> None:
@@ -503,65 +610,74 @@ def main() -> None:
         print_error("Project name is required")
     
     project_name = sys.argv[1]
-    project_dir = Path(sys.argv[2] if len(sys.argv) > 2 else ".")
-    
-    print_status("Please provide a brief description of your project for theme generation:")
-    project_description = input("> ")
-    
-    print_status(f"Starting project setup for {project_name}")
+    # Absolute, since the setup below changes into the project directory
+    project_dir = Path(sys.argv[2] if len(sys.argv) > 2 else ".").resolve()
     
+    # Fail on bad input or a missing key before asking for anything or touching the network
     validate_inputs(project_name)
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        print_error("OPENAI_API_KEY environment variable is required for theme generation")
     project_path = setup_project_directory(project_dir, project_name)
     
-    print_status("Cloning Flask2Fly template...")
-    
-    # Create temporary directory for cloning
-    temp_clone_path = Path("..") / "temp_clone"
-    
-    # Clean up existing temp_clone directory if it exists
-    if temp_clone_path.exists():
-        try:
-            shutil.rmtree(temp_clone_path)
-        except Exception as e:
-            safe_remove_git_dir(temp_clone_path)
-    
-    subprocess.run(["git", "clone", TEMPLATE_REPO, str(temp_clone_path)], check=True)
+    print_status("Please provide a brief description of your project for theme generation:")
+    project_description = input("> ")
     
-    # Move contents to actual project directory
-    project_path.mkdir(parents=True, exist_ok=True)
+    print_status(f"Starting project setup for {project_name}")
     
-    # Copy everything except .git
-    for item in temp_clone_path.iterdir():
-        if item.name != '.git':
-            if item.is_dir():
-                shutil.copytree(str(item), str(project_path / item.name), dirs_exist_ok=True)
-            else:
-                shutil.copy2(str(item), str(project_path))
+    # Transient API failures are retried by the client itself, with backoff
+    from openai import OpenAI
+    client = OpenAI(api_key=api_key, max_retries=3)
     
-    # Clean up temporary directory
-    safe_remove_git_dir(temp_clone_path)
+    # The generated content only depends on the inputs, so its API calls run
+    # alongside the setup below. The logo prompt needs the primary color, so it
+    # waits on the content call. The project directory does not exist until the
+    # clone, so the logo is staged outside it.
+    logo_staging_path = Path(tempfile.mkdtemp(prefix="flask2fly-")) / "logo.png"
+    # The staging directory is removed however the run ends, including print_error exits
+    try:
+        openai_executor = ThreadPoolExecutor(max_workers=2)
+        content_future = openai_executor.submit(generate_site_content, project_name, project_description, client)
+        logo_future = openai_executor.submit(
+            lambda: generate_logo(
+                project_name, project_description, content_future.result()[0]["primary-color"], logo_staging_path, client
+            )
+        )
     
-    # Change to project directory for remaining operations
-    os.chdir(project_path)
+        print_status("Cloning Flask2Fly template...")
     
-    # Perform all updates
-    rename_project_files(project_path, project_name)
-    update_python_files(project_path, project_name)
+        # Clone just the tip commit straight into place; its history is not kept
+        from dulwich import porcelain
+        porcelain.clone(TEMPLATE_REPO, str(project_path), depth=1)
+        safe_remove_git_dir(project_path / ".git")
     
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        print_error("OPENAI_API_KEY environment variable is required for theme generation")
+        # Change to project directory for remaining operations
+        os.chdir(project_path)
     
-    client = OpenAI(api_key=api_key)
+        # Perform all updates
+        rename_project_files(project_path, project_name)
+        spec = RenameSpec.for_project(project_name)
+        update_project_files(project_path, spec)
     
-    update_configuration_files(project_path, project_name, project_description, client)
-    initialize_modules(project_path)
-    initialize_project(project_path)
+        try:
+            colors, features = content_future.result()
+        except Exception as e:
+            print_error(f"Theme generation failed: {e}")
+        update_configuration_files(project_path, spec, project_description, features)
+        initialize_modules(project_path)
+        initialize_project(project_path)
     
-    # Generate and apply theme
-    print_status("Generating custom theme and logo...")
-    colors, logo_content = generate_theme(project_name, project_description)
-    update_theme_files(project_path, colors, logo_content)
+        # Wait for the logo started above and apply the theme
+        print_status("Generating custom theme and logo...")
+        try:
+            logo_future.result()
+        except Exception as e:
+            print_error(f"Theme generation failed: {e}")
+        finally:
+            openai_executor.shutdown()
+        update_theme_files(project_path, colors, logo_staging_path)
+    finally:
+        shutil.rmtree(logo_staging_path.parent, ignore_errors=True)
     print_success("Theme and logo generated successfully!")
     
     print_success(f"Project '{project_name}' has been successfully created!")
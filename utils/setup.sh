@@ -79,6 +79,7 @@ update_configuration_files() {
             # Update app name in configuration
             if [[ "$file" == "fly.toml" ]]; then
                 sed -i "s/^app = .*/app = '$NEW_PROJECT_NAME'/g" "$file"
+                sed -i "s|src/app_name/static|src/$NEW_PROJECT_NAME/static|g" "$file"
             fi
 
             # Update service name in docker-compose
@@ -192,11 +193,8 @@ setup_virtual_environment() {
 
 setup_git_hooks() {
     print_status "Setting up Git hooks..."
-    if [ ! -d ".git/hooks" ]; then
-        mkdir -p .git/hooks
-    fi
-    cp utils/pre-push .git/hooks/
-    chmod +x .git/hooks/pre-push
+    # Run the tracked hooks in place so later edits to them apply without a reinstall
+    git config core.hooksPath utils
 }
 
 initialize_project() {